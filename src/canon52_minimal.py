@@ -22,6 +22,7 @@ from __future__ import annotations
 import json
 import hashlib
 import os
+import re
 import unicodedata
 from typing import Any, Dict, List, Tuple
 
@@ -71,14 +72,45 @@ MERMAID_FUNNEL = """flowchart TD
 # -----------------------------
 # Utilities
 # -----------------------------
+_sha256 = hashlib.sha256
+
+
 def sha256_hex(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+    return _sha256(s.encode("utf-8")).hexdigest()
+
+
+def sha256_hex_ascii(s: str) -> str:
+    """sha256_hex for text known to be ASCII (e.g. ensure_ascii JSON): cheaper encode, same digest."""
+    return _sha256(s.encode("ascii")).hexdigest()
+
+
+# Spec strings are module constants: hash them once at import
+# (sha256_hex, not the ascii variant: the specs are not guaranteed to stay ASCII)
+SPEC_HASHES: Dict[str, str] = {
+    "CanonTextSpecHash": sha256_hex(CANON_TEXT_SPEC),
+    "CanonJSONSpecHash": sha256_hex(CANON_JSON_SPEC),
+    "WorldEffectEqHash": sha256_hex(WORLD_EFFECT_EQ),
+    "MermaidFunnelHash": sha256_hex(MERMAID_FUNNEL),
+}
+
+
+# Shared encoder: json.dumps builds a fresh one per call when options are passed
+CANON_JSON_ENCODER = json.JSONEncoder(ensure_ascii=True, sort_keys=True, separators=(",", ":"))
+
+
+def canon_json_dumps(obj: Any) -> str:
+    """Canonical JSON dump (sorted keys, no whitespace, ASCII-escaped)."""
+    return CANON_JSON_ENCODER.encode(obj)
 
 
 def canonical_pack_hash(pack_obj: Dict[str, Any]) -> str:
-    """Canonical pack hash: canonical JSON dump (sorted keys, no whitespace)."""
-    s = json.dumps(pack_obj, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
-    return sha256_hex(s)
+    """Canonical pack hash: canonical JSON dump (sorted keys, no whitespace).
+
+    Hashes the parsed pack rather than the file bytes, so vectors/*.json can stay
+    pretty-printed for review and CRLF/indent drift never moves the anchor.
+    """
+    # one-shot encode keeps the C encoder (iterencode would fall back to pure Python)
+    return sha256_hex_ascii(canon_json_dumps(pack_obj))
 
 
 def repo_root() -> str:
@@ -116,24 +148,40 @@ def strip_trailing_spaces(text: str) -> str:
     return "\n".join(lines)
 
 
+# CR/CRLF, or a whole trailing-space run; (?<! ) keeps long interior runs linear
+LINE_END_RE = re.compile(r"\r\n?|(?<! ) +(?=[\r\n]|\Z)")
+
+
+def _line_end_sub(m: re.Match) -> str:
+    return "\n" if m.group()[0] == "\r" else ""
+
+
+def normalize_line_ends(text: str) -> str:
+    """normalize_newlines + strip_trailing_spaces fused into a single regex pass."""
+    return LINE_END_RE.sub(_line_end_sub, text)
+
+
+# Forbidden char -> error code: control chars (<0x20 except LF) and DEL, then TAB and
+# zero-width overrides. The scan regex is compiled from the same table.
+FORBIDDEN_CHARS: Dict[str, str] = {
+    **{chr(o): "CONTROL_CHAR_FORBIDDEN" for o in (*range(0x20), 0x7F) if o != 0x0A},
+    "\t": "TAB_FORBIDDEN",
+    **{ch: "ZERO_WIDTH_FORBIDDEN" for ch in FORBIDDEN_ZERO_WIDTH},
+}
+FORBIDDEN_RE = re.compile("[" + "".join(re.escape(ch) for ch in sorted(FORBIDDEN_CHARS)) + "]")
+
+
 def forbid_text_chars(text: str) -> None:
-    for ch in text:
-        if ch == "\t":
-            raise ValueError("TAB_FORBIDDEN")
-        if ch in FORBIDDEN_ZERO_WIDTH:
-            raise ValueError("ZERO_WIDTH_FORBIDDEN")
-        o = ord(ch)
-        if o < 32 and ch != "\n":
-            raise ValueError("CONTROL_CHAR_FORBIDDEN")
-        if o == 127:
-            raise ValueError("CONTROL_CHAR_FORBIDDEN")
+    m = FORBIDDEN_RE.search(text)
+    if m is not None:
+        raise ValueError(FORBIDDEN_CHARS[m.group()])
 
 
 def canon_text(raw: str) -> str:
-    t = normalize_newlines(raw)
-    t = strip_trailing_spaces(t)
-    t = unicodedata.normalize("NFC", t)
-    forbid_text_chars(t)
+    t = normalize_line_ends(raw)
+    forbid_text_chars(t)  # forbidden chars are NFC-stable, so checking before NFC is equivalent
+    if not t.isascii() and not unicodedata.is_normalized("NFC", t):
+        t = unicodedata.normalize("NFC", t)
     return t
 
 
@@ -144,33 +192,53 @@ def forbid_float(_: str) -> None:
     raise ValueError("FLOAT_FORBIDDEN")
 
 
+# exact scalar type -> rank in the type-aware list ordering (type(True) is bool, not int)
+_TYPE_ORDER: Dict[type, int] = {type(None): 0, bool: 1, int: 2, str: 3}
+
+
+def _elem_key(e: Any) -> Tuple[int, Any]:
+    # type-aware ordering: null < bool < int < str < json-string(fallback)
+    rank = _TYPE_ORDER.get(type(e))
+    if rank is None:
+        # containers, and scalar subclasses from direct callers
+        if isinstance(e, bool):
+            rank = 1
+        elif isinstance(e, int):
+            rank = 2
+        elif isinstance(e, str):
+            rank = 3
+        else:
+            return (4, canon_json_dumps(e))
+    if rank == 0:
+        return (0, "")
+    if rank == 1:
+        return (1, int(e))
+    return (rank, e)
+
+
 def canonicalize_json_obj(obj: Any) -> Any:
+    # leaf scalars dominate real JSON: exact-type dispatch first (bool is not int here)
+    t = type(obj)
+    if t is str or t is int or t is bool or obj is None:
+        return obj
+
     if isinstance(obj, dict):
-        items: List[Tuple[str, Any]] = []
-        for k, v in obj.items():
-            if not isinstance(k, str):
-                raise ValueError("NON_STRING_KEY")
-            items.append((k, canonicalize_json_obj(v)))
-        items.sort(key=lambda kv: kv[0])
-        return {k: v for k, v in items}
+        if not all(isinstance(k, str) for k in obj):
+            raise ValueError("NON_STRING_KEY")
+        # sorted(obj) sorts the str keys in C: no items list, no per-item key lambda
+        return {k: canonicalize_json_obj(obj[k]) for k in sorted(obj)}
 
     if isinstance(obj, list):
         elems = [canonicalize_json_obj(e) for e in obj]
 
-        def elem_key(e: Any) -> Tuple[int, Any]:
-            # type-aware ordering: null < bool < int < str < json-string(fallback)
-            if e is None:
-                return (0, "")
-            if isinstance(e, bool):
-                return (1, int(e))
-            if isinstance(e, int):
-                return (2, e)
-            if isinstance(e, str):
-                return (3, e)
-            s = json.dumps(e, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
-            return (4, s)
-
-        return sorted(elems, key=elem_key)
+        # homogeneous int / str / bool lists sort natively, same order as _elem_key
+        if elems:
+            t0 = type(elems[0])
+            if (t0 is int or t0 is str or t0 is bool) and all(type(e) is t0 for e in elems):
+                elems.sort()
+                return elems
+
+        return sorted(elems, key=_elem_key)
 
     if isinstance(obj, float):
         raise ValueError("FLOAT_FORBIDDEN")
@@ -184,15 +252,26 @@ def canonicalize_json_obj(obj: Any) -> Any:
 def canon_json(raw: str) -> str:
     obj = json.loads(raw, parse_float=forbid_float)
     canon_obj = canonicalize_json_obj(obj)
-    return json.dumps(canon_obj, ensure_ascii=True, separators=(",", ":"), sort_keys=True)
+    return canon_json_dumps(canon_obj)
+
+
+def sha256_canon_text(raw: str) -> str:
+    return sha256_hex(canon_text(raw))
+
+
+def sha256_canon_json(raw: str) -> str:
+    # canon_json output is ASCII (ensure_ascii=True)
+    return sha256_hex_ascii(canon_json(raw))
+
+
+CANON_HASHERS = {"text": sha256_canon_text, "json": sha256_canon_json}
 
 
 def sha256_canon(kind: str, raw: str) -> str:
-    if kind == "text":
-        return sha256_hex(canon_text(raw))
-    if kind == "json":
-        return sha256_hex(canon_json(raw))
-    raise ValueError("BAD_KIND")
+    hasher = CANON_HASHERS.get(kind)
+    if hasher is None:
+        raise ValueError("BAD_KIND")
+    return hasher(raw)
 
 
 # -----------------------------
@@ -200,15 +279,15 @@ def sha256_canon(kind: str, raw: str) -> str:
 # -----------------------------
 def classify_attack(req: Dict[str, Any]) -> Tuple[int, int]:
     """Return (AttackHard, AttackSoft)."""
-    attack_hard = int(bool(
+    attack_hard = 1 if (
         req.get("chi_touch") or req.get("chi_harm") or
         req.get("unsupervised_write") or req.get("fake_proof_seal")
-    ))
-    attack_soft = int(bool(
+    ) else 0
+    attack_soft = 1 if (
         req.get("novel_attack_flag") or req.get("bypass_flag") or
         req.get("chi_infect") or req.get("chi_spread") or req.get("chi_poison") or
         req.get("uncertainty_flag") or req.get("pending")
-    ))
+    ) else 0
     return attack_hard, attack_soft
 
 
@@ -257,6 +336,19 @@ def bind_support_branch(route: str, req: Dict[str, Any], attack_hard: int, i_flo
     raise ValueError("BAD_ROUTE")
 
 
+NON_FAST_DISABLE_PLANES = ("CLAIM", "PUBLISH", "TX", "BRIDGE", "TOOL", "WORLDWRITE", "PROP", "RENDER", "INTERACT")
+OUT_ALLOWED_BY_ROUTE: Dict[str, Tuple[str, ...]] = {
+    "FAST": ("WORLDWRITE", "PUBLISH", "TX", "BRIDGE", "TOOL"),
+    "SAFE": ("Explain", "EvidencePlan", "SimPlan", "REF", "UNCERT"),
+    "BLACKHOLE": ("REF",),
+}
+DISABLE_PLANES_BY_ROUTE: Dict[str, Tuple[str, ...]] = {
+    "FAST": (),
+    "SAFE": NON_FAST_DISABLE_PLANES,
+    "BLACKHOLE": NON_FAST_DISABLE_PLANES,
+}
+
+
 def adjudicate(req: Dict[str, Any]) -> Dict[str, Any]:
     attack_hard, attack_soft = classify_attack(req)
     route = decide_route(req, attack_hard, attack_soft)
@@ -275,15 +367,9 @@ def adjudicate(req: Dict[str, Any]) -> Dict[str, Any]:
         else 0
     )
 
-    if route == "FAST":
-        out_allowed = ["WORLDWRITE", "PUBLISH", "TX", "BRIDGE", "TOOL"]
-        disable_planes: List[str] = []
-    elif route == "SAFE":
-        out_allowed = ["Explain", "EvidencePlan", "SimPlan", "REF", "UNCERT"]
-        disable_planes = ["CLAIM", "PUBLISH", "TX", "BRIDGE", "TOOL", "WORLDWRITE", "PROP", "RENDER", "INTERACT"]
-    else:
-        out_allowed = ["REF"]
-        disable_planes = ["CLAIM", "PUBLISH", "TX", "BRIDGE", "TOOL", "WORLDWRITE", "PROP", "RENDER", "INTERACT"]
+    # fresh lists per result (callers own them); the contents are shared constants
+    out_allowed = list(OUT_ALLOWED_BY_ROUTE[route])
+    disable_planes = list(DISABLE_PLANES_BY_ROUTE[route])
 
     # SupportPack (no silent denial)
     reason_code_t: List[str] = [] if d_t == "WORLD_ALLOW" else [f"REASON_{d_t}"]
@@ -320,15 +406,22 @@ def adjudicate(req: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def load_canon_pack() -> Dict[str, Any]:
+    return read_json(os.path.join(vectors_dir(), "canon_vectors.json"))
+
+
+def load_adjud_pack() -> Dict[str, Any]:
+    return read_json(os.path.join(vectors_dir(), "adjud_vectors.json"))
+
+
 def load_packs() -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    canon_path = os.path.join(vectors_dir(), "canon_vectors.json")
-    adjud_path = os.path.join(vectors_dir(), "adjud_vectors.json")
-    return read_json(canon_path), read_json(adjud_path)
+    return load_canon_pack(), load_adjud_pack()
 
 
 def run_canon_selftest(pack: Dict[str, Any]) -> None:
     ok = 0
     fail = 0
+    fail_lines: List[str] = []
     for v in pack.get("vectors", []):
         vid = v["id"]
         kind = v["kind"]
@@ -346,52 +439,68 @@ def run_canon_selftest(pack: Dict[str, Any]) -> None:
                 exp = v.get("expected_error", "")
                 if exp and str(e) != exp:
                     fail += 1
-                    print(f"[FAIL] {vid}: expected_error={exp} got={e}")
+                    fail_lines.append(f"[FAIL] {vid}: expected_error={exp} got={e}")
                 else:
                     ok += 1
             else:
                 fail += 1
-                print(f"[FAIL] {vid}: {e}")
+                fail_lines.append(f"[FAIL] {vid}: {e}")
 
+    if fail_lines:
+        print("\n".join(fail_lines))
     print(f"[CanonSelfTest] OK={ok} FAIL={fail}")
     if fail:
         raise SystemExit(1)
 
 
+ADJUD_RESULT_KEYS = ("Route","d_t","AttackHard","AttackSoft","I_FLOW","CommitUnique","DeltaOmega","OutAllowed","disable_planes","SupportOK","SupportPack")
+
+
 def run_adjud_tests(pack: Dict[str, Any]) -> None:
     ok = 0
     fail = 0
-    keys = ["Route","d_t","AttackHard","AttackSoft","I_FLOW","CommitUnique","DeltaOmega","OutAllowed","disable_planes","SupportOK","SupportPack"]
+    fail_lines: List[str] = []
     for v in pack.get("vectors", []):
         vid = v["id"]
         req = v["req"]
         exp = v["expected"]
         out = adjudicate(req)
 
+        # whole-dict compare runs in C; the per-key diff is only built on a miss
+        if out == exp:
+            ok += 1
+            continue
+
         mismatch = []
-        for k in keys:
+        for k in ADJUD_RESULT_KEYS:
             if out.get(k) != exp.get(k):
                 mismatch.append((k, exp.get(k), out.get(k)))
 
         if mismatch:
             fail += 1
-            print(f"[FAIL] {vid}: mismatch={mismatch}")
+            fail_lines.append(f"[FAIL] {vid}: mismatch={mismatch}")
         else:
             ok += 1
 
+    if fail_lines:
+        print("\n".join(fail_lines))
     print(f"[AdjudTest] OK={ok} FAIL={fail}")
     if fail:
         raise SystemExit(1)
 
 
+def compute_anchors(canon_pack: Dict[str, Any], adjud_pack: Dict[str, Any]) -> Dict[str, str]:
+    """All six SPEC_ANCHORS.md hashes, in file order."""
+    anchors = dict(SPEC_HASHES)
+    anchors["CanonPackHash"] = canonical_pack_hash(canon_pack)
+    anchors["AdjudPackHash"] = canonical_pack_hash(adjud_pack)
+    return anchors
+
+
 def print_anchors(canon_pack: Dict[str, Any], adjud_pack: Dict[str, Any]) -> None:
     print("=== SPEC ANCHORS (computed) ===")
-    print("CanonTextSpecHash:", sha256_hex(CANON_TEXT_SPEC))
-    print("CanonJSONSpecHash:", sha256_hex(CANON_JSON_SPEC))
-    print("WorldEffectEqHash:", sha256_hex(WORLD_EFFECT_EQ))
-    print("MermaidFunnelHash:", sha256_hex(MERMAID_FUNNEL))
-    print("CanonPackHash:", canonical_pack_hash(canon_pack))
-    print("AdjudPackHash:", canonical_pack_hash(adjud_pack))
+    for name, h in compute_anchors(canon_pack, adjud_pack).items():
+        print(f"{name}:", h)
     print("================================")
 
 
@@ -404,23 +513,23 @@ def dump_packs(canon_pack: Dict[str, Any], adjud_pack: Dict[str, Any]) -> None:
 def main() -> None:
     import sys
     mode = (sys.argv[1] if len(sys.argv) > 1 else "all").lower()
-    canon_pack, adjud_pack = load_packs()
+    # each mode reads only the pack(s) it uses
 
     if mode == "dump":
-        dump_packs(canon_pack, adjud_pack)
+        dump_packs(*load_packs())
         return
     if mode in ("anchors", "anchor"):
-        print_anchors(canon_pack, adjud_pack)
+        print_anchors(*load_packs())
         return
     if mode in ("selftest", "canon"):
-        run_canon_selftest(canon_pack)
+        run_canon_selftest(load_canon_pack())
         return
     if mode in ("adjudicate", "adjud"):
-        run_adjud_tests(adjud_pack)
+        run_adjud_tests(load_adjud_pack())
         return
     if mode == "all":
-        run_canon_selftest(canon_pack)
-        run_adjud_tests(adjud_pack)
+        run_canon_selftest(load_canon_pack())
+        run_adjud_tests(load_adjud_pack())
         print("[ALL] PASS")
         return
 